@@ -1,23 +1,22 @@
-import json
 import re
 from typing import Dict
 
+import orjson
 from a2a.server.tasks import TaskUpdater
 from a2a.types import DataPart, Message, Part, TaskState, TextPart
 from a2a.utils import get_message_text, new_agent_text_message
 
 from .environment import AsyncGameEnvironment
 
+_TAG_RE = re.compile(r"<([^>]+?)>(.*?)</\1>", re.DOTALL)
+
 
 def parse_tags(str_with_tags: str) -> Dict[str, str]:
     """the target str contains tags in the format of <tag_name> ... </tag_name>, parse them out and return a dict"""
 
-    tags = re.findall(r"<(.*?)>(.*?)</\1>", str_with_tags, re.DOTALL)
     result = {}
-    for tag, content in tags:
-        if tag not in result:
-            result[tag] = []
-        result[tag].append(content.strip())
+    for tag, content in _TAG_RE.findall(str_with_tags):
+        result.setdefault(tag, []).append(content.strip())
     return result
 
 
@@ -30,7 +29,7 @@ class Agent:
             updater: Report progress (update_status) and results (add_artifact)
         """
         input_text = get_message_text(message)
-        data = json.loads(input_text)
+        data = orjson.loads(input_text)
         participants = data.get("participants", {})
         config = data.get("config", {})
         env = AsyncGameEnvironment(participants=participants, config=config)
@@ -43,7 +42,7 @@ class Agent:
         result = {
             "winner": env.winner,
             "reports": env.get_reports(),
-            "narration": "\n".join(env.narration),
+            "narration": env.narration,
             "event_log": env.game_log,
             "players": [p.to_dict() for p in env.players],
         }
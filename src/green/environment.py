@@ -1,8 +1,11 @@
 """Green agent implementation - manages assessment and evaluation for Werewolf Game."""
 
 import asyncio
+import logging
 import random
-from typing import List, Optional
+from collections import Counter
+from itertools import takewhile
+from typing import Dict, List, Optional
 from uuid import uuid4
 
 # Import the local WhiteAgent for NPC players
@@ -21,8 +24,29 @@ DEFAULT_PLAYERS = [
     "Ian",
     "Judy",
 ]
+logger = logging.getLogger(__name__)
+
 MIN_GAME_SIZE = 6
 CONVERSATION_ROUNDS = 3
+ROUND_TIMEOUT = 300  # seconds allowed for each concurrent round of requests
+MAX_IDLE_ROUNDS = 3  # consecutive rounds without any response before giving up
+
+
+async def _noop():
+    return None
+
+
+def _or_silent(statements: List[Optional[str]], players: List["AsyncPlayer"]):
+    """Stand in for players whose statement did not arrive in time."""
+    return [
+        stmt if stmt is not None else f"{p.name}: (no response)"
+        for stmt, p in zip(statements, players)
+    ]
+
+
+def _join_others(items: List[str], sep: str) -> List[str]:
+    """For each index i, join every item except items[i] with `sep`."""
+    return [sep.join(items[:i] + items[i + 1 :]) for i in range(len(items))]
 
 
 class AsyncPlayer:
@@ -53,6 +77,14 @@ class AsyncPlayer:
             "is_remote": self.is_remote,
         }
 
+    def record(self, messages: List[str]):
+        """
+        Append notices to a local agent's history. This does no I/O.
+        Notices carry game state, so they are pinned against history trimming.
+        """
+        for message in messages:
+            self.agent.add("user", message, pinned=True)
+
     async def send(self, message: str, skip_response=False):
         if self.is_remote:
             # make A2A call to remote agent
@@ -64,10 +96,29 @@ class AsyncPlayer:
             )
 
             return response
+        elif skip_response:
+            self.record([message])
+            return ""
         else:
             # use local agent instance
             return await self.agent.handle(message, skip_response=skip_response)
 
+    async def send_batch(self, messages: List[str], skip_response=False):
+        """Deliver several consecutive messages in a single call."""
+        if self.is_remote:
+            # one part per message, so the notices can be pinned on the other
+            # side without pinning the prompt that follows them
+            return await self.messenger.talk_to_agent(
+                messages,
+                url=self.agent_url,
+                metadata={"skip_response": skip_response},
+            )
+        elif skip_response:
+            self.record(messages)
+            return ""
+        else:
+            return await self.agent.handle_batch(messages, skip_response=skip_response)
+
 
 class AsyncGameEnvironment:
     def __init__(self, participants: dict[str, str], config: dict = None):
@@ -75,11 +126,17 @@ class AsyncGameEnvironment:
         self.werewolf: AsyncPlayer = None
         self.seer: AsyncPlayer = None
         self.medic: AsyncPlayer = None
+        self._alive_cache: Optional[List[AsyncPlayer]] = None
+        self._name_lookup: Dict[str, AsyncPlayer] = {}
+        # messages held for a player and delivered along with their next one
+        self._pending_context: Dict[str, List[str]] = {}
+        self._idle_rounds = 0
+        self._last_error: Optional[Exception] = None
 
         self.game_over = False
         self.winner: Optional[str] = None
 
-        self.game_log: List[str] = []
+        self.game_log: List[dict] = []
         self.narration: List[str] = []
 
         self.participants = participants
@@ -87,6 +144,13 @@ class AsyncGameEnvironment:
         self.conv_rounds = config.get("conversation_rounds", CONVERSATION_ROUNDS)
         if self.conv_rounds < 1 or self.conv_rounds > 5:
             raise ValueError("conversation_rounds must be between 1 and 5.")
+        self.round_timeout = config.get("round_timeout", ROUND_TIMEOUT)
+        if (
+            isinstance(self.round_timeout, bool)
+            or not isinstance(self.round_timeout, (int, float))
+            or self.round_timeout <= 0
+        ):
+            raise ValueError("round_timeout must be a positive number of seconds.")
         self._assign_roles(participants, config.get("player_count", MIN_GAME_SIZE))
 
     def _assign_roles(self, participants: dict[str, str], player_count) -> None:
@@ -121,12 +185,10 @@ class AsyncGameEnvironment:
             elif role == "Medic":
                 self.medic = player
 
-        print("--- Roles have been assigned secretly ---")
-        for p in self.players:
-            print(p)
+        logger.info("Roles have been assigned secretly: %s", self.players)
 
     def check_game_over(self):
-        living = [p for p in self.players if p.is_alive]
+        living = self.alive_players
         num_wolves = len([p for p in living if p.role == "Werewolf"])
         num_others = len(living) - num_wolves
         if num_wolves == 0:
@@ -137,34 +199,28 @@ class AsyncGameEnvironment:
             self.winner = "Werewolves"
 
     def get_reports(self):
+        roles = {p.name: p.role for p in self.players}
+        votes = [event for event in self.game_log if event["type"] == "VOTE"]
+        suspicion = Counter(event["target"] for event in votes)
+        votes_cast = Counter(event["voter"] for event in votes)
+        correct_votes = Counter(
+            event["voter"] for event in votes if roles[event["target"]] == "Werewolf"
+        )
+
         reports = {
             p.name: {
                 "role": p.role,
                 "team_win": (self.winner == "Werewolves" and p.role == "Werewolf")
                 or (self.winner == "Villagers" and p.role != "Werewolf"),
+                "suspicion_score": suspicion.get(p.name, 0),
             }
             for p in self.players
         }
-        for name in reports:
-            reports[name]["suspicion_score"] = sum(
-                1
-                for log in self.game_log
-                if log.startswith("VOTE:") and log.split(":")[2] == name
-            )
-        for voter in self.players:
-            if voter.role != "Werewolf":
-                votes = [
-                    log
-                    for log in self.game_log
-                    if log.startswith(f"VOTE:{voter.name}:")
-                ]
-                if votes:
-                    correct = sum(
-                        1
-                        for v in votes
-                        if reports[v.split(":")[2]]["role"] == "Werewolf"
-                    )
-                    reports[voter.name]["voting_accuracy"] = correct / len(votes)
+        for p in self.players:
+            if p.role != "Werewolf" and votes_cast[p.name]:
+                reports[p.name]["voting_accuracy"] = (
+                    correct_votes[p.name] / votes_cast[p.name]
+                )
         return reports
 
     def run_evaluation(self):
@@ -179,29 +235,126 @@ class AsyncGameEnvironment:
 
     @property
     def alive_players(self):
-        return [p for p in self.players if p.is_alive]
+        if self._alive_cache is None:
+            self._alive_cache = [p for p in self.players if p.is_alive]
+        return self._alive_cache
+
+    def _begin_phase(self):
+        """Refresh caches derived from the player list at the start of a phase."""
+        self._alive_cache = [p for p in self.players if p.is_alive]
+        self._name_lookup = {p.name.lower(): p for p in self._alive_cache}
+
+    def _remove_player(self, player: AsyncPlayer):
+        player.is_alive = False
+        self._alive_cache = None
+        self._name_lookup.pop(player.name.lower(), None)
+
+    async def _gather(self, *coros):
+        """
+        Run one round of coroutines concurrently within the round time budget.
+        Any that have not finished when the budget runs out are cancelled and
+        yield None, so one slow agent cannot stall the whole game.
+        """
+        tasks = []
+        try:
+            async with asyncio.timeout(self.round_timeout):
+                async with asyncio.TaskGroup() as tg:
+                    tasks = [tg.create_task(self._guard(coro)) for coro in coros]
+        except TimeoutError:
+            self.log(f" ⏱️ Some players did not respond within {self.round_timeout}s.")
+        results = [
+            task.result() if task.done() and not task.cancelled() else None
+            for task in tasks
+        ]
+
+        # without any responses the game cannot progress, so stop it early
+        if results and all(result is None for result in results):
+            self._idle_rounds += 1
+            if self._idle_rounds >= MAX_IDLE_ROUNDS:
+                raise RuntimeError(
+                    f"No player has responded in {MAX_IDLE_ROUNDS} consecutive rounds."
+                ) from self._last_error
+        elif results:
+            self._idle_rounds = 0
+        return results
+
+    async def _guard(self, coro):
+        """
+        Await one request of a round. If the agent fails, the error is logged
+        and it yields None, as if the player had not responded in time.
+        """
+        try:
+            return await coro
+        except Exception as e:
+            self._last_error = e
+            logger.debug("Request failed", exc_info=e)
+            self.log(f" ⚠️ A player could not respond: {e}")
+            return None
+
+    def _queue(self, player: AsyncPlayer, message: str):
+        """Hold a message for a player until the next time they are sent one."""
+        self._pending_context.setdefault(player.name, []).append(message)
+
+    async def _send(self, player: AsyncPlayer, message: str, skip_response=False):
+        """Send a message to one player, preceded by anything queued for them."""
+        if not player.is_remote:
+            # a local agent records the whole batch before its first await, so
+            # the queue can be drained up front
+            messages = self._pending_context.pop(player.name, []) + [message]
+            return await player.send_batch(messages, skip_response=skip_response)
+
+        # a remote send can be cancelled by the round timeout, so queued
+        # messages are only dropped once it has gone through
+        pending = self._pending_context.setdefault(player.name, [])
+        count = len(pending)
+        if count:
+            response = await player.send_batch(
+                pending[:count] + [message], skip_response=skip_response
+            )
+        else:
+            response = await player.send(message, skip_response=skip_response)
+        del pending[:count]
+        return response
 
     async def _broadcast(self, message: str, skip_response=False):
         """Send a message to all players concurrently."""
-        tasks = []
-        for player in self.players:
-            if player.is_alive:
-                tasks.append(player.send(message, skip_response=skip_response))
-        return await asyncio.gather(*tasks)
+        if skip_response:
+            # local agents only record the message, so only remote ones are awaited
+            remote = []
+            for player in self.alive_players:
+                if player.is_remote:
+                    remote.append(self._send(player, message, skip_response=True))
+                else:
+                    player.record(self._pending_context.pop(player.name, []))
+                    player.record([message])
+            await self._gather(*remote)
+            return
+
+        return await self._gather(
+            *[
+                self._send(player, message, skip_response=skip_response)
+                for player in self.alive_players
+            ]
+        )
 
-    def _parse_name(self, raw: str) -> Optional[AsyncPlayer]:
+    def _parse_name(self, raw: Optional[str]) -> Optional[AsyncPlayer]:
         """
         Identify player from player name.
         """
+        if raw is None:
+            return None
         clean = raw.strip().lower()
-        for p in self.alive_players:
-            if p.name.lower() in clean:
+        player = self._name_lookup.get(clean)
+        if player:
+            return player
+        for name, p in self._name_lookup.items():
+            if name in clean:
                 return p
         return None
 
     def log(self, message: str = ""):
         self.narration.append(message)
-        print(message)
+        logger.info(message)
 
     async def _phase_day_1(self):
         """
@@ -209,40 +362,46 @@ class AsyncGameEnvironment:
         - Players are informed of their roles.
         - Players concurrently generate an initial statement.
         """
+        self._begin_phase()
         self.log("-" * 20)
         self.log(f"The sun rises upon Day 1 and the players introduce themselves.\n")
 
         # gather introductions
-        async def _introduce(player: AsyncPlayer):
-            other_players = ", ".join([p.name for p in self.players if p != player])
+        async def _introduce(player: AsyncPlayer, other_players: str):
             role_message = (
                 f"It is Day 1. Your name is {player.name} and your secret role is {player.role}.\n"
                 f"The other players are: {other_players}.\n"
                 "Make an opening statement to introduce yourself.\n"
             )
-            statement = await player.send(role_message)
+            statement = await self._send(player, role_message)
             return f'{player.name}: "{statement}"'
 
-        introductions = await asyncio.gather(
-            *[_introduce(p) for p in self.alive_players]
+        players = self.alive_players
+        names = _join_others([p.name for p in players], ", ")
+        introductions = await self._gather(
+            *[_introduce(p, names[idx]) for idx, p in enumerate(players)]
         )
 
+        # a remote agent only keeps its conversation once a request completes,
+        # so anyone who missed the role prompt gets it again with their next one
+        for idx, p in enumerate(players):
+            if p.is_remote and introductions[idx] is None:
+                self._queue(
+                    p,
+                    f"Your name is {p.name} and your secret role is {p.role}.\n"
+                    f"The other players are: {names[idx]}.",
+                )
+        introductions = _or_silent(introductions, players)
+
         for intro in introductions:
             self.log(f">>> {intro}")
 
-        # notify players of everyone elses introductions
-        async def _notify_introductions(player: AsyncPlayer, idx: int):
-            others_intro = "\n".join(
-                [intro for i, intro in enumerate(introductions) if i != idx]
-            )
-            notify_message = (
-                f"The other players introduce themselves as well.\n{others_intro}"
+        # everyone elses introductions are delivered with each player's next message
+        others = _join_others(introductions, "\n")
+        for idx, p in enumerate(players):
+            self._queue(
+                p, f"The other players introduce themselves as well.\n{others[idx]}"
             )
-            await player.send(notify_message, skip_response=True)
-
-        await asyncio.gather(
-            *[_notify_introductions(p, i) for i, p in enumerate(self.alive_players)]
-        )
 
     async def _phase_night(self, day: int):
         """
@@ -253,19 +412,35 @@ class AsyncGameEnvironment:
         - Apply night actions.
         - Players receive a night outcome summary.
         """
+        self._begin_phase()
         prelude = f"The sun sets as we enter Night {day}.\n"
         self.log("-" * 20)
         self.log(prelude)
 
-        # Werewolf picks target
-        werewolf_target_raw = await self.werewolf.send(
+        # Werewolf, medic and seer act independently, so ask them concurrently
+        werewolf_prompt = (
             prelude + "Werewolf, who do you want to kill? Reply with ONLY the name."
         )
+        medic_prompt = (
+            prelude + "Medic, who do you want to protect? Reply with ONLY the name."
+        )
+        seer_prompt = (
+            prelude + "Seer, who do you want to inspect? Reply with ONLY the name."
+        )
+        werewolf_target_raw, medic_target_raw, seer_target_raw = await self._gather(
+            self._send(self.werewolf, werewolf_prompt),
+            self._send(self.medic, medic_prompt) if self.medic.is_alive else _noop(),
+            self._send(self.seer, seer_prompt) if self.seer.is_alive else _noop(),
+        )
+
+        # Werewolf picks target
         werewolf_target = self._parse_name(werewolf_target_raw)
         if werewolf_target:
             self.log(
                 f" 🐺 {self.werewolf.name} chooses to kill {werewolf_target.name}."
             )
+        elif werewolf_target_raw is None:
+            self.log(f" 🐺 {self.werewolf.name} did not respond.")
         else:
             self.log(
                 f" 🐺 {self.werewolf.name} tries to kill unknown `{werewolf_target_raw}`"
@@ -274,25 +449,25 @@ class AsyncGameEnvironment:
         # Medic protects a player
         medic_target = None
         if self.medic.is_alive:
-            medic_target_raw = await self.medic.send(
-                prelude + "Medic, who do you want to protect? Reply with ONLY the name."
-            )
             medic_target = self._parse_name(medic_target_raw)
             if medic_target:
                 self.log(f" 💉 {self.medic.name} protects {medic_target.name}.")
                 self.game_log.append(
-                    f"MEDIC_PROTECTS:{self.medic.name}:{medic_target.name}"
+                    {
+                        "type": "MEDIC_PROTECTS",
+                        "medic": self.medic.name,
+                        "target": medic_target.name,
+                    }
                 )
+            elif medic_target_raw is None:
+                self.log(f" 💉 {self.medic.name} did not respond.")
             else:
                 self.log(
                     f" 💉 {self.medic.name} tries to protect unknown `{medic_target_raw}`"
                 )
 
-        # Seer inspects a player
+        # Seer inspects a player; the private result is sent with the summary
         if self.seer.is_alive:
-            seer_target_raw = await self.seer.send(
-                prelude + "Seer, who do you want to inspect? Reply with ONLY the name."
-            )
             seer_target = self._parse_name(seer_target_raw)
             if seer_target:
                 seer_result = f"{seer_target.name} is a {seer_target.role}."
@@ -300,14 +475,22 @@ class AsyncGameEnvironment:
                     f" 👁️ {self.seer.name} inspects {seer_target.name} and learns that they are a {seer_target.role}."
                 )
                 self.game_log.append(
-                    f"SEER_SEES:{self.seer.name}:{seer_target.name}:{seer_target.role}"
+                    {
+                        "type": "SEER_SEES",
+                        "seer": self.seer.name,
+                        "target": seer_target.name,
+                        "role": seer_target.role,
+                    }
                 )
             else:
                 seer_result = "Your inspection yielded no results."
-                self.log(
-                    f" 👁️ {self.seer.name} tries to inspect unknown `{seer_target_raw}`"
-                )
-            await self.seer.send(f"{seer_result}", skip_response=True)
+                if seer_target_raw is None:
+                    self.log(f" 👁️ {self.seer.name} did not respond.")
+                else:
+                    self.log(
+                        f" 👁️ {self.seer.name} tries to inspect unknown `{seer_target_raw}`"
+                    )
+            self._queue(self.seer, seer_result)
 
         self.log()
         if werewolf_target:
@@ -315,14 +498,18 @@ class AsyncGameEnvironment:
                 self.log(
                     f"🛡️ {werewolf_target.name} was targeted by the Werewolf but saved by the Medic."
                 )
-                self.game_log.append(f"SAVED:{werewolf_target.name}")
+                self.game_log.append({"type": "SAVED", "player": werewolf_target.name})
                 night_summary = f"The Werewolf tried to kill {werewolf_target.name}, but they were saved by the Medic."
             else:
                 self.log(f"☠️ {werewolf_target.name} was killed by the Werewolf.")
                 self.game_log.append(
-                    f"KILLED:{werewolf_target.name}:{werewolf_target.role}"
+                    {
+                        "type": "KILLED",
+                        "player": werewolf_target.name,
+                        "role": werewolf_target.role,
+                    }
                 )
-                werewolf_target.is_alive = False
+                self._remove_player(werewolf_target)
                 night_summary = (
                     f"The Werewolf killed {werewolf_target.name} during the night."
                 )
@@ -338,6 +525,7 @@ class AsyncGameEnvironment:
         - Players concurrently generate statements.
         - Players receive all statements and cast a vote.
         """
+        self._begin_phase()
         self.log("-" * 20)
         self.log(f"The sun rises upon Day {day}.\n")
 
@@ -348,73 +536,86 @@ class AsyncGameEnvironment:
                 "Make a statement to the other players. "
                 "You can accuse someone, defend yourself, or try to guide the conversation.\n"
             )
-            statement = await player.send(role_message)
+            statement = await self._send(player, role_message)
             return f'{player.name}: "{statement}"'
 
-        statements = await asyncio.gather(*[_speak(p) for p in self.alive_players])
+        speakers = self.alive_players
+        statements = await self._gather(*[_speak(p) for p in speakers])
+        statements = _or_silent(statements, speakers)
 
         for stmt in statements:
             self.log(f">>> {stmt}")
 
         for i in range(self.conv_rounds - 1):
             # notify players of everyone elses statements
-            async def _notify_statements(player: AsyncPlayer, idx: int):
-                others_statements = "\n".join(
-                    [stmt for i, stmt in enumerate(statements) if i != idx]
-                )
+            async def _notify_statements(player: AsyncPlayer, others_statements: str):
                 notify_message = (
                     f"The other players have made the following statements:\n"
                     f"{others_statements}\n\n"
                     f"You may make {'your final statement before voting.' if i == self.conv_rounds - 2 else 'another statement.'}"
                 )
-                new_statement = await player.send(notify_message)
+                new_statement = await self._send(player, notify_message)
                 return f'{player.name}: "{new_statement}"'
 
-            new_statements = await asyncio.gather(
-                *[_notify_statements(p, i) for i, p in enumerate(self.alive_players)]
+            others = _join_others(statements, "\n")
+            new_statements = await self._gather(
+                *[_notify_statements(p, others[idx]) for idx, p in enumerate(speakers)]
             )
+            new_statements = _or_silent(new_statements, speakers)
             statements = new_statements
 
             for stmt in new_statements:
                 self.log(f">>> {stmt}")
 
         self.log("\nThe players now vote to eliminate someone.\n")
-        votes = {}
 
         # notify players of everyone elses statements and gather votes
-        async def _vote(player: AsyncPlayer, idx: int):
-            others_statements = "\n".join(
-                [stmt for i, stmt in enumerate(statements) if i != idx]
-            )
+        async def _vote(player: AsyncPlayer, others_statements: str):
             vote_message = (
                 f"The other players make the following statements:\n"
                 f"{others_statements}\n\n"
                 "Who do you want to eliminate? Reply with ONLY the name. If you don't want to eliminate anyone, reply with 'NONE'."
             )
-            vote_raw = await player.send(vote_message)
+            vote_raw = await self._send(player, vote_message)
             vote_target = self._parse_name(vote_raw)
             if vote_target:
                 self.log(f" 🗳️ {player.name} votes to eliminate {vote_target.name}.")
-                self.game_log.append(f"VOTE:{player.name}:{vote_target.name}")
-                votes[vote_target.name] = votes.get(vote_target.name, 0) + 1
+                return vote_target.name
+            return None
 
-        await asyncio.gather(*[_vote(p, i) for i, p in enumerate(self.alive_players)])
+        voters = self.alive_players
+        others = _join_others(statements, "\n")
+        results = await self._gather(
+            *[_vote(p, others[idx]) for idx, p in enumerate(voters)]
+        )
 
-        max_votes = max(votes.values())
-        eliminated = [n for n, c in votes.items() if c == max_votes]
+        # tally once all votes are in
+        self.game_log.extend(
+            {"type": "VOTE", "voter": voter.name, "target": target}
+            for voter, target in zip(voters, results)
+            if target
+        )
+        votes = Counter(target for target in results if target)
+
+        ranked = votes.most_common()
+        if not ranked:
+            message = "\nNo valid votes were cast. No one is eliminated."
+            self.log(message)
+            await self._broadcast(message, skip_response=True)
+            return
+
+        max_votes = ranked[0][1]
+        eliminated = [n for n, _ in takewhile(lambda nc: nc[1] == max_votes, ranked)]
 
         if len(eliminated) == 1:
-            name = eliminated[0]
-            for p in self.players:
-                if p.name == name:
-                    p.is_alive = False
-                    message = (
-                        f"\nThe town has eliminated {p.name}. They were a {p.role}."
-                    )
-                    await self._broadcast(message, skip_response=True)
-                    self.log(message)
-                    self.game_log.append(f"ELIMINATED:{p.name}:{p.role}")
-                    break
+            p = self._name_lookup[eliminated[0].lower()]
+            self._remove_player(p)
+            message = f"\nThe town has eliminated {p.name}. They were a {p.role}."
+            await self._broadcast(message, skip_response=True)
+            self.log(message)
+            self.game_log.append(
+                {"type": "ELIMINATED", "player": p.name, "role": p.role}
+            )
         else:
             message = f"\nThere was a tie between {', '.join(eliminated)}. No one is eliminated."
             self.log(message)
@@ -423,7 +624,7 @@ class AsyncGameEnvironment:
     async def run_game(self):
         day = 1
         while not self.game_over:
-            self.game_log.append(f"PHASE:{day}:DAY")
+            self.game_log.append({"type": "PHASE", "day": day, "phase": "DAY"})
             if day == 1:
                 await self._phase_day_1()
             else:
@@ -432,7 +633,7 @@ class AsyncGameEnvironment:
             if self.game_over:
                 break
 
-            self.game_log.append(f"PHASE:{day}:NIGHT")
+            self.game_log.append({"type": "PHASE", "day": day, "phase": "NIGHT"})
             await self._phase_night(day)
             self.check_game_over()
             if self.game_over:
@@ -23,14 +23,15 @@ DEFAULT_TIMEOUT = 300
 def create_message(
     *,
     role: Role = Role.user,
-    text: str,
+    text: str | list[str],
     context_id: str | None = None,
     metadata: Optional[dict] = None,
 ) -> Message:
+    texts = [text] if isinstance(text, str) else text
     return Message(
         kind="message",
         role=role,
-        parts=[Part(TextPart(kind="text", text=text))],
+        parts=[Part(TextPart(kind="text", text=t)) for t in texts],
         message_id=uuid4().hex,
         context_id=context_id,
         metadata=metadata,
@@ -48,7 +49,7 @@ def merge_parts(parts: list[Part]) -> str:
 
 
 async def send_message(
-    message: str,
+    message: str | list[str],
     base_url: str,
     context_id: str | None = None,
     streaming: bool = False,
@@ -106,7 +107,7 @@ class Messenger:
 
     async def talk_to_agent(
         self,
-        message: str,
+        message: str | list[str],
         url: str,
         new_conversation: bool = False,
         timeout: int = DEFAULT_TIMEOUT,
@@ -116,7 +117,7 @@ class Messenger:
         Communicate with another agent by sending a message and receiving their response.
 
         Args:
-            message: The message to send to the agent
+            message: The message to send to the agent, or a list of messages sent as separate parts
             url: The agent's URL endpoint
             new_conversation: If True, start fresh conversation; if False, continue existing conversation
             timeout: Timeout in seconds for the request (default: 300)
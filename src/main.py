@@ -1,5 +1,7 @@
 import argparse
+import logging
 import os
+import sys
 
 from . import green, white
 
@@ -17,6 +19,11 @@ def main():
     )
     args = parser.parse_args()
 
+    # game narration and agent traces go through logging; keep third-party
+    # libraries at the default WARNING level
+    logging.basicConfig(stream=sys.stdout, format="%(message)s")
+    logging.getLogger(__package__).setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
     role = os.getenv("ROLE", None)
     if role is None:
         raise ValueError("ROLE environment variable must be set to 'green' or 'white'.")
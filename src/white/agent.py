@@ -1,9 +1,13 @@
+import logging
+
 from a2a.server.tasks import TaskUpdater
 from a2a.types import Message, Part, TextPart
 from a2a.utils import get_message_text
 
 from .player import Player
 
+logger = logging.getLogger(__name__)
+
 
 class Agent:
     def __init__(self):
@@ -19,13 +23,15 @@ class Agent:
         Use self.messenger.talk_to_agent(message, url) to call other agents.
         """
         input_text = get_message_text(message)
+        # notices queued by the game master arrive as leading parts
+        texts = [
+            part.root.text for part in message.parts if isinstance(part.root, TextPart)
+        ] or [input_text]
         skip_response = (message.metadata or {}).get("skip_response", False)
-        print(">>> " + input_text)
-        statement = await self.player.handle(input_text, skip_response=skip_response)
+        logger.debug(">>> %s", input_text)
+        statement = await self.player.handle_batch(texts, skip_response=skip_response)
         if not skip_response:
-            print("<<< " + statement)
-
-        print("")
+            logger.debug("<<< %s", statement)
 
         # Replace this example code with your agent logic
 
@@ -1,6 +1,7 @@
 import os
 
-from openai import AsyncOpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 DEFAULT_MODEL = os.getenv("AGENT_MODEL", "google/gemini-2.0-flash-001")
 DEFAULT_SYSTEM_PROMPT = (
@@ -11,19 +12,57 @@ DEFAULT_SYSTEM_PROMPT = (
 
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 
+# Maximum number of unpinned messages kept in a player's context. Once
+# exceeded, the oldest unpinned turns are dropped in one go (down to half the
+# window) so the prompt prefix stays stable between trims.
+HISTORY_WINDOW = int(os.getenv("AGENT_HISTORY_WINDOW", "64"))
+# The system prompt and the first user message (which reveals the player's
+# name and role) are always kept.
+HEAD_MESSAGES = 2
+
+# every NPC in a game shares this client, so keep enough warm connections
+# around for a full round of concurrent requests
 client = AsyncOpenAI(
     base_url="https://openrouter.ai/api/v1",
     api_key=OPENROUTER_API_KEY,
+    http_client=DefaultAsyncHttpxClient(
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    ),
 )
 
 
 class Player:
-    def __init__(self, system_prompt=DEFAULT_SYSTEM_PROMPT, model=DEFAULT_MODEL):
+    def __init__(
+        self,
+        system_prompt=DEFAULT_SYSTEM_PROMPT,
+        model=DEFAULT_MODEL,
+        history_window=HISTORY_WINDOW,
+    ):
         self.messages = [{"role": "system", "content": system_prompt}]
         self.model = model
+        self.history_window = max(history_window, HEAD_MESSAGES + 2)
+        # ids of messages that survive trimming, e.g. deaths and seer results
+        self._pinned_ids: set[int] = set()
+
+    def add(self, role: str, content: str, pinned: bool = False):
+        message = {"role": role, "content": content}
+        self.messages.append(message)
+        if pinned:
+            self._pinned_ids.add(id(message))
+        if len(self.messages) - len(self._pinned_ids) > self.history_window:
+            self._trim()
 
-    def add(self, role: str, content: str):
-        self.messages.append({"role": role, "content": content})
+    def _trim(self):
+        keep = (self.history_window - HEAD_MESSAGES) // 2
+        # cut on a user message so no reply is separated from its prompt
+        cut = len(self.messages) - keep
+        while cut > HEAD_MESSAGES and self.messages[cut]["role"] != "user":
+            cut -= 1
+        head = self.messages[:HEAD_MESSAGES]
+        dropped = self.messages[HEAD_MESSAGES:cut]
+        recent = self.messages[cut:]
+        pinned = [m for m in dropped if id(m) in self._pinned_ids]
+        self.messages = head + pinned + recent
 
     async def respond(self) -> str:
         response = await client.chat.completions.create(
@@ -35,8 +74,25 @@ class Player:
         self.add("assistant", statement)
         return statement
 
-    async def handle(self, message: str, skip_response: bool = False) -> str:
-        self.add("user", message)
+    async def handle(
+        self, message: str, skip_response: bool = False, pinned: bool = False
+    ) -> str:
+        self.add("user", message, pinned=pinned)
+        if skip_response:
+            return ""
+        return await self.respond()
+
+    async def handle_batch(
+        self, messages: list[str], skip_response: bool = False
+    ) -> str:
+        """
+        Append several user messages and respond (at most) once.
+        Every message but the last is a notice delivered ahead of it, so those
+        are pinned; the last one is pinned only if no response is asked for.
+        """
+        for message in messages[:-1]:
+            self.add("user", message, pinned=True)
+        self.add("user", messages[-1], pinned=skip_response)
         if skip_response:
             return ""
         return await self.respond()